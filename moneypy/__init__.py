@@ -1 +1,2 @@
 from .money import Money  # noqa:  F401
+from .streams import rolling_sum, running_balance  # noqa:  F401
@@ -9,3 +9,8 @@ MALFORMATTED_CURRENCY_CODE_MESSAGE = (
     "currency code should consist of three uppercase letters, not '{code}'".format
 )
 CONVERT_INFO = ", convert to 'int' or 'Decimal' first"
+WINDOW_TYPE_MESSAGE = "window should be {expected} not '{type}'".format
+NON_POSITIVE_WINDOW_MESSAGE = "window should be positive, not '{window}'".format
+UNORDERED_KEYS_MESSAGE = (
+    "keys should be non-decreasing, got '{key}' after '{previous}'".format
+)
@@ -0,0 +1,170 @@
+from collections import deque
+from datetime import timedelta
+from decimal import Context, Decimal, Rounded, getcontext
+from functools import reduce
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional, Tuple, cast
+
+from .exceptions import IncompatibleCurrencyError
+from .messages import (
+    INCOMPATIBLE_CURRENCY_MESSAGE,
+    NON_POSITIVE_WINDOW_MESSAGE,
+    TYPE_ERROR_MESSAGE,
+    UNORDERED_KEYS_MESSAGE,
+    WINDOW_TYPE_MESSAGE,
+)
+from .money import Money
+
+
+# Both generators below accumulate plain `Decimal`s and create `Money` objects only for
+# the values they yield, with the smallest exponent of the summed amounts as the
+# precision -- the same one `Money.__add__` ends up with, so the amounts are the same as
+# the ones you get by chaining `+` on `Money` objects. For `running_balance` it is simply
+# the exponent of the accumulator, `rolling_sum` has to track it for the current window.
+# Once a window sum doesn't fit in the context precision, chained `+` rounds it step by
+# step, so `rolling_sum` sums such windows item by item the same way, until the window
+# fits again.
+
+def running_balance(
+        iterable: Iterable[Money], opening: Optional[Money]=None,
+) -> Iterator[Money]:
+    """Yield the balance after each `Money` object of `iterable`.
+
+    Without `opening` the balance starts with the first object of `iterable`.
+    """
+    iterator = iter(iterable)
+    if opening is None:
+        try:
+            opening = next(iterator)
+        except StopIteration:
+            return
+        _validate_money(opening)
+        yield opening
+    else:
+        _validate_money(opening)
+
+    currency = opening.currency
+    total = opening.amount
+    for money in iterator:
+        total += _validate_money(money, currency)
+        yield Money(total, currency, precision=total)
+
+
+def rolling_sum(
+        iterable: Iterable[Any], window: Any,
+        key: Optional[Callable[[Any], Any]]=None,
+        amount: Optional[Callable[[Any], Money]]=None,
+) -> Iterator[Money]:
+    """Return an iterator of the sums of the current window after each item of `iterable`.
+
+    Without `key` the window holds the last `window` items (`window` is an `int`). With
+    `key` it holds the items whose keys are greater than `key(item) - window` (and always
+    the current item), in which case keys have to be non-decreasing and `window` is
+    a number or a `timedelta` (e.g. for `datetime` keys). `amount` gets the `Money`
+    object out of an item, by default the item itself is used.
+    """
+    _validate_window(window, by_key=key is not None)
+    return _rolling_sum(iterable, window, key, amount)
+
+
+def _rolling_sum(
+        iterable: Iterable[Any], window: Any,
+        key: Optional[Callable[[Any], Any]],
+        amount: Optional[Callable[[Any], Money]],
+) -> Iterator[Money]:
+    context = getcontext().copy()
+    currency: Optional[str] = None
+    # `total` and `abs_total` are exact sums of the window as long as `exact` is true
+    total = abs_total = Decimal(0)
+    exact = True
+    in_window: Deque[Tuple[Any, int, Decimal]] = deque()
+    # positions and exponents of the items in the window, with increasing exponents, so
+    # that the first one is always the smallest exponent in the window
+    exponents: Deque[Tuple[int, int]] = deque()
+    # chaining `+` gives a negative zero only if all the summed amounts are negative zeros
+    not_negative_zeros = 0
+    for position, item in enumerate(iterable):
+        money = item if amount is None else amount(item)
+        value = _validate_money(money, currency)
+        if currency is None:
+            currency = money.currency
+
+        if key is None:
+            current = position
+        else:
+            current = key(item)
+            if in_window and current < in_window[-1][0]:
+                raise ValueError(
+                    UNORDERED_KEYS_MESSAGE(key=current, previous=in_window[-1][0]))
+        start = current - window
+
+        in_window.append((current, position, value))
+        exponent = cast(int, value.as_tuple().exponent)
+        while exponents and exponents[-1][1] >= exponent:
+            exponents.pop()
+        exponents.append((position, exponent))
+        not_negative_zeros += not _is_negative_zero(value)
+
+        context.clear_flags()
+        total = context.add(total, value)
+        abs_total = context.add(abs_total, value.copy_abs())
+        while len(in_window) > 1 and in_window[0][0] <= start:
+            _, evicted_position, evicted_value = in_window.popleft()
+            total = context.subtract(total, evicted_value)
+            abs_total = context.subtract(abs_total, evicted_value.copy_abs())
+            if exponents[0][0] == evicted_position:
+                exponents.popleft()
+            not_negative_zeros -= not _is_negative_zero(evicted_value)
+
+        if not exact or context.flags[Rounded]:
+            total, abs_total, exact = _chained_sums(
+                context, [value for _, _, value in in_window])
+            if not exact:
+                yield Money(total, currency, precision=total)
+                continue
+        if not not_negative_zeros:
+            total = Decimal('-0')
+        yield Money(total, currency, precision=Decimal((0, (1,), exponents[0][1])))
+
+
+def _chained_sums(
+        context: Context, values: List[Decimal],
+) -> Tuple[Decimal, Decimal, bool]:
+    # sums `values` (and their absolute values) the way chaining `+` on `Money` objects
+    # does; if the sum of the absolute values doesn't get rounded, no partial sum in any
+    # order does, so the sums are exact
+    context.clear_flags()
+    total = reduce(context.add, values)
+    abs_total = reduce(context.add, (value.copy_abs() for value in values))
+    return total, abs_total, not context.flags[Rounded]
+
+
+def _validate_window(window: Any, by_key: bool) -> None:
+    if by_key:
+        expected_types: Tuple[type, ...] = (int, float, Decimal, timedelta)
+        expected = "a number or 'timedelta'"
+    else:
+        expected_types = (int,)
+        expected = "'int'"
+    if isinstance(window, bool) or not isinstance(window, expected_types):
+        raise TypeError(
+            WINDOW_TYPE_MESSAGE(expected=expected, type=type(window).__name__))
+
+    zero: Any = timedelta(0) if isinstance(window, timedelta) else 0
+    if window <= zero:
+        raise ValueError(NON_POSITIVE_WINDOW_MESSAGE(window=window))
+
+
+def _is_negative_zero(amount: Decimal) -> bool:
+    return amount.is_zero() and amount.is_signed()
+
+
+def _validate_money(money: Any, currency: Optional[str]=None) -> Decimal:
+    if not isinstance(money, Money):
+        raise TypeError(TYPE_ERROR_MESSAGE(
+            op_name='add', self=Money.__name__, other=type(money).__name__,
+            additional_info='',
+        ))
+    if currency is not None and money.currency != currency:
+        raise IncompatibleCurrencyError(INCOMPATIBLE_CURRENCY_MESSAGE(
+            c1=currency, c2=money.currency, op='add'))
+    return money.amount
@@ -0,0 +1,277 @@
+"""Differential tests of `Money` engines against the reference `Money` semantics.
+
+An engine is a callable taking an opening `Money` object and a sequence of operations
+(see `operations` strategy) and returning the outcome of each step (see `outcome`).
+The reference engine applies the operators of `Money` itself; every other engine listed
+in `ENGINES` has to produce exactly the same outcomes, including the precision (exponent)
+of the amounts and the types of raised errors. Hypothesis shrinks a failing case, so
+the reported divergence is a minimized one.
+
+Amounts have mixed precisions and up to the 28 digits of the default context
+precision, so the precision rules are exercised at the point where sums get rounded and
+quantizing raises `InvalidOperation`, by the stream tests as well.
+"""
+from decimal import Decimal, InvalidOperation
+from functools import reduce
+from operator import add, eq, floordiv, lt, mul, neg, sub, truediv
+from typing import NamedTuple
+
+from hypothesis import given, settings, strategies as st
+import pytest
+
+from moneypy.exceptions import IncompatibleCurrencyError
+from moneypy.money import Money
+from moneypy.streams import rolling_sum, running_balance
+
+
+# ====================================== STRATEGIES ======================================
+
+currencies = st.sampled_from(['EUR', 'EUR', 'EUR', 'USD'])
+places = st.one_of(
+    st.integers(min_value=0, max_value=6),
+    st.integers(min_value=0, max_value=20),
+)
+
+
+@st.composite
+def coefficients(draw, min_digits=1):
+    # up to the 28 digits of the default context precision, so that sums get rounded
+    # and quantizing raises `InvalidOperation`; the number of digits is drawn first, as
+    # Hypothesis rarely draws big integers from a wide range
+    digits = draw(st.integers(min_value=min_digits, max_value=28))
+    coefficient = draw(
+        st.integers(min_value=10 ** (digits - 1), max_value=10 ** digits - 1))
+    return draw(st.sampled_from([-1, 1])) * coefficient
+
+
+@st.composite
+def decimals(draw, min_digits=1):
+    coefficient = draw(st.one_of(st.just(0), coefficients(min_digits)))
+    return Decimal(coefficient).scaleb(-draw(places))
+
+
+@st.composite
+def moneys(draw, currency=currencies, min_digits=1):
+    amount = draw(decimals(min_digits))
+    precision = Decimal(1).scaleb(-draw(places))
+    currency_code = draw(currency)
+    try:
+        return Money(amount, currency_code, precision)
+    except InvalidOperation:
+        # too many digits for the precision, keep the precision of the amount
+        return Money(amount, currency_code, amount)
+
+
+def operations(money_operands, scalars):
+    non_numbers = st.one_of(st.floats(allow_nan=False), st.text(max_size=3), st.none())
+    return st.lists(st.one_of(
+        st.tuples(
+            st.sampled_from(['add', 'sub', 'eq', 'lt']),
+            st.one_of(money_operands, scalars),
+        ),
+        st.tuples(
+            st.sampled_from(
+                ['mul', 'rmul', 'truediv', 'rtruediv', 'floordiv', 'rfloordiv']),
+            st.one_of(scalars, non_numbers, money_operands),
+        ),
+        st.tuples(st.just('neg'), st.none()),
+    ), min_size=1, max_size=10)
+
+
+small_scalars = st.integers(min_value=-100, max_value=100)
+# amounts with many digits (of one currency) get to the context precision boundary
+high_digit_moneys = moneys(st.just('EUR'), min_digits=20)
+
+
+# ======================================= ENGINES ========================================
+
+def outcome(result):
+    if isinstance(result, (Money, Amount)):
+        return ('money', result.amount.as_tuple(), result.currency)
+    return ('value', result)
+
+
+def reference_engine(opening, ops):
+    operators = {
+        'add': add, 'sub': sub, 'eq': eq, 'lt': lt, 'mul': mul, 'truediv': truediv,
+        'floordiv': floordiv,
+        'rmul': lambda x, y: y * x,
+        'rtruediv': lambda x, y: y / x,
+        'rfloordiv': lambda x, y: y // x,
+        'neg': lambda x, y: neg(x),
+    }
+    return _run(opening, ops, operators)
+
+
+class Amount(NamedTuple):
+    """State of `decimal_model_engine`, an amount and a currency without `Money`."""
+    amount: Decimal
+    currency: str
+
+
+def decimal_model_engine(opening, ops):
+    """Model of the documented `Money` rules on plain `Decimal`s.
+
+    The model never creates `Money` objects, so it checks the rounding and quantizing
+    done by `Money` itself as well.
+    """
+    def quantized(amount, exponent):
+        return amount.quantize(Decimal((0, (1,), exponent)))
+
+    def exponent(amount):
+        return amount.as_tuple().exponent
+
+    def same_currency_amount(x, y):
+        if not isinstance(y, Money):
+            raise TypeError
+        if x.currency != y.currency:
+            raise IncompatibleCurrencyError
+        return y.amount
+
+    def number(y):
+        if not isinstance(y, (int, Decimal)):
+            raise TypeError
+        return y
+
+    def keeping_precision(function):
+        # the result keeps the precision of the `Money` operand
+        def operator(x, y):
+            amount = function(x.amount, number(y))
+            return Amount(quantized(amount, exponent(x.amount)), x.currency)
+        return operator
+
+    def add_amounts(a, b, currency):
+        # the result keeps the precision of the sum: the smaller one of the two operands,
+        # unless the sum gets rounded to the context precision
+        amount = a + b
+        return Amount(quantized(amount, exponent(amount)), currency)
+
+    def negated(amount):
+        # negation goes back to the default precision of two decimal places
+        return quantized(-amount, -2)
+
+    operators = {
+        'add': lambda x, y: add_amounts(
+            x.amount, same_currency_amount(x, y), x.currency),
+        'sub': lambda x, y: add_amounts(
+            x.amount, negated(same_currency_amount(x, y)), x.currency),
+        'eq': lambda x, y: x.amount == same_currency_amount(x, y),
+        'lt': lambda x, y: x.amount < same_currency_amount(x, y),
+        'mul': keeping_precision(mul),
+        'rmul': keeping_precision(mul),
+        'truediv': keeping_precision(truediv),
+        'rtruediv': keeping_precision(lambda a, b: b / a),
+        'floordiv': keeping_precision(floordiv),
+        'rfloordiv': keeping_precision(lambda a, b: b // a),
+        'neg': lambda x, y: Amount(negated(x.amount), x.currency),
+    }
+    return _run(Amount(opening.amount, opening.currency), ops, operators)
+
+
+def _run(opening, ops, operators):
+    outcomes = []
+    current = opening
+    for op_name, other in ops:
+        try:
+            result = operators[op_name](current, other)
+        except Exception as e:
+            outcomes.append(('error', type(e)))
+            break
+        outcomes.append(outcome(result))
+        if isinstance(result, (Money, Amount)):
+            current = result
+    return outcomes
+
+
+# Optimized engines go here.
+ENGINES = [decimal_model_engine]
+
+
+def assert_same_outcomes(ops, expected, actual):
+    for step, (expected_step, actual_step) in enumerate(zip(expected, actual)):
+        assert expected_step == actual_step, (
+            f'first divergence at step {step} ({ops[step]!r}): '
+            f'expected {expected_step!r}, got {actual_step!r}'
+        )
+    assert len(expected) == len(actual), (
+        f'expected {len(expected)} steps, got {len(actual)}')
+
+
+# ======================================== TESTS =========================================
+
+@pytest.mark.parametrize('engine', ENGINES)
+@settings(max_examples=300, deadline=None)
+@given(opening=moneys(), ops=operations(moneys(), st.one_of(small_scalars, decimals())))
+def test_engine_should_match_reference_money_semantics(engine, opening, ops):
+    assert_same_outcomes(ops, reference_engine(opening, ops), engine(opening, ops))
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@settings(max_examples=300, deadline=None)
+@given(
+    opening=high_digit_moneys,
+    ops=operations(high_digit_moneys, st.one_of(small_scalars, decimals(min_digits=20))),
+)
+def test_engine_should_match_reference_money_semantics_near_context_precision(engine, opening, ops):  # noqa: E501
+    assert_same_outcomes(ops, reference_engine(opening, ops), engine(opening, ops))
+
+
+@settings(deadline=None)
+@given(opening=moneys(st.just('EUR')), items=st.lists(moneys(currencies)))
+def test_running_balance_should_match_chained_add(opening, items):
+    expected = []
+    try:
+        for i in range(len(items)):
+            expected.append(outcome(reduce(add, items[:i + 1], opening)))
+    except IncompatibleCurrencyError:
+        expected.append(('error', IncompatibleCurrencyError))
+
+    actual = []
+    try:
+        for balance in running_balance(items, opening=opening):
+            actual.append(outcome(balance))
+    except IncompatibleCurrencyError:
+        actual.append(('error', IncompatibleCurrencyError))
+
+    assert_same_outcomes(items, expected, actual)
+
+
+@settings(deadline=None)
+@given(
+    items=st.lists(moneys(st.just('EUR')), min_size=1),
+    window=st.integers(min_value=1, max_value=5),
+)
+def test_rolling_sum_by_count_should_match_chained_add_of_window(items, window):
+    expected = [
+        outcome(reduce(add, items[max(0, i + 1 - window):i + 1]))
+        for i in range(len(items))
+    ]
+    actual = [outcome(s) for s in rolling_sum(items, window)]
+
+    assert_same_outcomes(items, expected, actual)
+
+
+@settings(deadline=None)
+@given(
+    steps=st.lists(
+        st.tuples(st.integers(min_value=0, max_value=10), moneys(st.just('EUR'))),
+        min_size=1,
+    ),
+    window=st.integers(min_value=1, max_value=20),
+)
+def test_rolling_sum_by_key_should_match_chained_add_of_window(steps, window):
+    items = []
+    key = 0
+    for step, money in steps:
+        key += step
+        items.append((key, money))
+    expected = [
+        outcome(reduce(add, [m for k, m in items[:i + 1] if k > key_ - window]))
+        for i, (key_, _) in enumerate(items)
+    ]
+    actual = [
+        outcome(s) for s in rolling_sum(
+            items, window, key=lambda t: t[0], amount=lambda t: t[1])
+    ]
+
+    assert_same_outcomes(items, expected, actual)
@@ -0,0 +1,184 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from functools import reduce
+from operator import add
+
+import pytest
+
+from moneypy.exceptions import IncompatibleCurrencyError
+from moneypy.money import Money
+from moneypy.streams import rolling_sum, running_balance
+
+
+# ================================ TEST RUNNING BALANCE ==================================
+
+@pytest.mark.parametrize('amounts', [
+    ['10', '20', '-5'],
+    ['0.01', '-0.01', '0.00'],
+    ['-100', '50.50', '49.50', '0.0001'],
+])
+def test_running_balance_should_match_chained_add(amounts):
+    moneys = [Money(amount, 'EUR', '.0000') for amount in amounts]
+    opening = Money('1.1', 'EUR', '.0')
+    expected = [reduce(add, moneys[:i + 1], opening) for i in range(len(moneys))]
+
+    balances = list(running_balance(moneys, opening=opening))
+
+    assert balances == expected
+    assert [b.amount.as_tuple() for b in balances] == [
+        e.amount.as_tuple() for e in expected]
+
+
+def test_running_balance_without_opening_should_start_with_first_item():
+    moneys = [Money(10, 'USD'), Money(-3, 'USD'), Money(2, 'USD')]
+    assert list(running_balance(moneys)) == [
+        Money(10, 'USD'), Money(7, 'USD'), Money(9, 'USD')]
+
+
+def test_running_balance_of_empty_iterable_should_be_empty():
+    assert list(running_balance([])) == []
+    assert list(running_balance([], opening=Money(10, 'USD'))) == []
+
+
+def test_running_balance_should_not_work_between_different_currencies():
+    balances = running_balance([Money(1, 'EUR'), Money(2, 'USD')])
+    assert next(balances) == Money(1, 'EUR')
+    with pytest.raises(IncompatibleCurrencyError):
+        next(balances)
+
+    with pytest.raises(IncompatibleCurrencyError):
+        list(running_balance([Money(1, 'EUR')], opening=Money(1, 'USD')))
+
+
+@pytest.mark.parametrize('non_money_object', [
+    10, 10.0, '10', Decimal('10'), [10],
+])
+def test_running_balance_should_not_work_with_instances_of_other_types(non_money_object):
+    with pytest.raises(TypeError):
+        list(running_balance([Money(1, 'EUR'), non_money_object]))
+
+    with pytest.raises(TypeError):
+        list(running_balance([Money(1, 'EUR')], opening=non_money_object))
+
+    with pytest.raises(TypeError):
+        list(running_balance([non_money_object, Money(1, 'EUR')]))
+
+
+def test_running_balance_should_not_take_none_as_end_of_stream():
+    with pytest.raises(TypeError):
+        list(running_balance([None, Money(1, 'EUR')]))
+
+
+# =================================== TEST ROLLING SUM ===================================
+
+@pytest.mark.parametrize('window, expected_amounts', [
+    (1, ['1', '2', '4', '8']),
+    (2, ['1', '3', '6', '12']),
+    (3, ['1', '3', '7', '14']),
+    (10, ['1', '3', '7', '15']),
+])
+def test_rolling_sum_by_count(window, expected_amounts):
+    moneys = [Money(amount, 'PLN') for amount in (1, 2, 4, 8)]
+    assert list(rolling_sum(moneys, window)) == [
+        Money(amount, 'PLN') for amount in expected_amounts]
+
+
+@pytest.mark.parametrize('items, window', [
+    ([Money(1, 'EUR', '.0001'), Money(2, 'EUR'), Money(3, 'EUR')], 1),
+    ([Money(1, 'EUR', '.000001')] + [Money(1, 'EUR')] * 3, 2),
+    ([Money(1, 'EUR'), Money(1, 'EUR', '.0001'), Money(1, 'EUR', '.001')], 2),
+    ([Money(1, 'EUR', '.001'), Money(1, 'EUR', '.0001'), Money(1, 'EUR', '1')], 2),
+    ([Money('-0.001', 'EUR'), Money('-0.001', 'EUR', '.0'), Money(1, 'EUR')], 2),
+    ([Money(1, 'EUR'), Money('-0.001', 'EUR'), Money('-0.001', 'EUR')], 2),
+    ([Money(1, 'EUR'), Money(-1, 'EUR'), Money('-0.001', 'EUR')], 3),
+    # window sums that don't fit in the context precision get rounded
+    ([Money('0.01', 'EUR'), Money('1e27', 'EUR', '1'), Money('0.01', 'EUR')], 2),
+    ([Money('1e27', 'EUR', '1'), Money('0.01', 'EUR'), Money('0.01', 'EUR')], 2),
+    ([Money('9e27', 'EUR', '1'), Money('9e27', 'EUR', '1'), Money('-9e27', 'EUR', '1'),
+      Money('0.01', 'EUR')], 3),
+])
+def test_rolling_sum_should_match_chained_add_of_window(items, window):
+    expected = [
+        reduce(add, items[max(0, i + 1 - window):i + 1]) for i in range(len(items))
+    ]
+
+    sums = list(rolling_sum(items, window))
+
+    assert sums == expected
+    assert [s.amount.as_tuple() for s in sums] == [
+        e.amount.as_tuple() for e in expected]
+
+
+def test_rolling_sum_by_key():
+    transactions = [
+        (date(2018, 1, 1), Money(1, 'PLN')),
+        (date(2018, 1, 15), Money(2, 'PLN')),
+        (date(2018, 1, 30), Money(4, 'PLN')),
+        (date(2018, 1, 31), Money(8, 'PLN')),
+        (date(2018, 1, 31), Money(16, 'PLN')),
+        (date(2018, 3, 1), Money(32, 'PLN')),
+    ]
+    sums = rolling_sum(
+        transactions, timedelta(days=30),
+        key=lambda t: t[0], amount=lambda t: t[1],
+    )
+    assert list(sums) == [
+        Money(amount, 'PLN') for amount in (1, 3, 7, 14, 30, 56)]
+
+
+@pytest.mark.parametrize('key, window', [
+    (2.0 ** 53, 0.5),
+    (Decimal('1e30'), Decimal('0.5')),
+])
+def test_rolling_sum_by_key_should_always_keep_the_current_item(key, window):
+    # `key - window` rounds back to `key` here
+    sums = rolling_sum(
+        [(key, Money(1, 'PLN')), (key, Money(2, 'PLN'))], window,
+        key=lambda t: t[0], amount=lambda t: t[1],
+    )
+    assert list(sums) == [Money(1, 'PLN'), Money(2, 'PLN')]
+
+
+def test_rolling_sum_by_key_should_require_non_decreasing_keys():
+    sums = rolling_sum(
+        [(2, Money(1, 'PLN')), (1, Money(1, 'PLN'))], 10,
+        key=lambda t: t[0], amount=lambda t: t[1],
+    )
+    with pytest.raises(ValueError):
+        list(sums)
+
+
+@pytest.mark.parametrize('window, key', [
+    (0, None),
+    (-1, None),
+    (timedelta(0), lambda t: t),
+    (-1, lambda t: t),
+    (Decimal('-0.5'), lambda t: t),
+])
+def test_rolling_sum_should_require_positive_window(window, key):
+    with pytest.raises(ValueError):
+        rolling_sum([Money(1, 'PLN')], window, key=key)
+
+
+@pytest.mark.parametrize('window, key', [
+    (1.5, None),
+    (Decimal(1), None),
+    (timedelta(1), None),
+    (True, None),
+    (True, lambda t: t),
+    ('1', lambda t: t),
+    (None, lambda t: t),
+])
+def test_rolling_sum_should_require_window_of_proper_type(window, key):
+    with pytest.raises(TypeError):
+        rolling_sum([Money(1, 'PLN')], window, key=key)
+
+
+def test_rolling_sum_should_not_work_between_different_currencies():
+    with pytest.raises(IncompatibleCurrencyError):
+        list(rolling_sum([Money(1, 'PLN'), Money(1, 'EUR')], 1))
+
+
+def test_rolling_sum_should_not_work_with_instances_of_other_types():
+    with pytest.raises(TypeError):
+        list(rolling_sum([Money(1, 'PLN'), 1], 2))